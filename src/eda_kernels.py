@@ -0,0 +1,59 @@
+from functools import lru_cache
+import logging
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional: fall back to NumPy
+    numba = None
+
+# -----------------------------
+# Config
+# -----------------------------
+NUMBA_MIN_ROWS = 200_000  # below this, JIT dispatch costs more than it saves
+
+# -----------------------------
+# Kernels
+# -----------------------------
+@lru_cache(maxsize=None)
+def _group_sum_count_kernel() -> Optional[Callable]:
+    """
+    Compile the grouped sum/count kernel once per process (None without numba).
+    Each thread accumulates its own slice of rows into a private row of the
+    output, so no two threads ever write the same cell.
+    """
+    if numba is None:
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def kernel(codes, values, ngroups, nchunks):
+        n = codes.shape[0]
+        sums = np.zeros((nchunks, ngroups))
+        counts = np.zeros((nchunks, ngroups), np.int64)
+        step = (n + nchunks - 1) // nchunks
+        for c in numba.prange(nchunks):
+            for i in range(c * step, min(n, (c + 1) * step)):
+                g = codes[i]
+                sums[c, g] += values[i]
+                counts[c, g] += 1
+        return sums.sum(axis=0), counts.sum(axis=0)
+
+    logging.info("Compiling numba group_sum_count kernel (cached after first run).")
+    return kernel
+
+def group_sum_count(codes: np.ndarray, values: np.ndarray, ngroups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-group sum of values and row count, for codes in [0, ngroups).
+    Large inputs go through the numba kernel when numba is installed;
+    everything else uses np.bincount.
+    """
+    codes = np.ascontiguousarray(codes, dtype=np.int64)
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    kernel = _group_sum_count_kernel() if len(codes) >= NUMBA_MIN_ROWS else None
+    if kernel is None:
+        sums = np.bincount(codes, weights=values, minlength=ngroups)
+        counts = np.bincount(codes, minlength=ngroups)
+        return sums, counts
+    return kernel(codes, values, ngroups, numba.get_num_threads())
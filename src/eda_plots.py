@@ -1,20 +1,44 @@
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 import math
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use("Agg")  # headless: figures are only ever written to PNG
+from matplotlib.figure import Figure
+
+from eda_kernels import group_sum_count
 
 # -----------------------------
 # Config
 # -----------------------------
 FIG_DIR = Path("src/figures")
 REPORTS_DIR = Path("reports")
+# Compact load-time dtypes: nullable small ints and Arrow-backed strings. rating stays
+# float64; float32 storage error would otherwise leak into the report averages.
+DTYPES = {
+    "year": "Int16",
+    "rating": "float64",
+    "votes": "Int32",
+    "runtime_min": "Int16",
+    "title": "string[pyarrow]",
+    "genres": "string[pyarrow]",
+    "directors": "string[pyarrow]",
+    "certificate": "category",
+    "imdb_id": "string[pyarrow]",
+    "url": "string[pyarrow]",
+}
+NUMERIC_COLS = ("year", "rating", "votes", "runtime_min")
+HEXBIN_MIN_POINTS = 5000  # above this, votes-vs-rating is drawn as a 2D histogram
 FIG_DIR.mkdir(parents=True, exist_ok=True)
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
+matplotlib.rcParams["path.simplify"] = True
+matplotlib.rcParams["path.simplify_threshold"] = 1.0
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(levelname)s: %(message)s"
@@ -23,35 +47,63 @@ logging.basicConfig(
 # -----------------------------
 # Utils
 # -----------------------------
-def save_current_fig(filename: str, dpi: int = 120):
-    """Save the current matplotlib figure and close it."""
+def save_fig(fig: Figure, filename: str, dpi: int = 120):
+    """Save a figure under FIG_DIR. Figures are built without pyplot, so there is no global state to close."""
     out_path = FIG_DIR / filename
-    plt.gcf().savefig(out_path, bbox_inches="tight", dpi=dpi)
-    plt.close()
+    fig.savefig(out_path, bbox_inches="tight", dpi=dpi)
     logging.info(f"Saved figure -> {out_path}")
 
+def save_table(df: pd.DataFrame, name: str, fmt: str = "csv", index: bool = False):
+    """Save a report table under REPORTS_DIR as CSV or Snappy-compressed Parquet."""
+    out_path = REPORTS_DIR / f"{name}.{fmt}"
+    if fmt == "parquet":
+        df.to_parquet(out_path, engine="pyarrow", compression="snappy", index=index)
+    else:
+        df.to_csv(out_path, index=index)
+    logging.info(f"Saved table -> {out_path}")
+
+def load_dataset(path: Path) -> pd.DataFrame:
+    """Load the scraper output with compact DTYPES, picking the reader from the file suffix."""
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path, engine="pyarrow")
+        return df.astype({c: t for c, t in DTYPES.items() if c in df.columns})
+    try:
+        return pd.read_csv(path, dtype=DTYPES, engine="pyarrow")
+    except ValueError as e:
+        # Hand-edited files may hold non-numeric junk; keep the old forgiving load
+        logging.warning(f"Typed CSV load failed ({e}); falling back to untyped read.")
+        return pd.read_csv(path)
+
 def coerce_numeric(series: pd.Series) -> pd.Series:
-    """Safely coerce to numeric."""
+    """Safely coerce to numeric; already-numeric columns are returned as-is."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
     return pd.to_numeric(series, errors="coerce")
 
 def normalize_genres(df: pd.DataFrame) -> pd.DataFrame:
     if "genres" not in df.columns:
         return df
-    s = df["genres"].astype(str).replace({"nan": ""}).fillna("")
-    main = (
-        s.str.split(",")
-         .str[0]
-         .str.strip()
-         .replace({"": np.nan})
-    )
-    df["main_genre"] = main
+    # First comma-separated genre in one vectorised regex pass on Arrow-backed strings
+    # (no per-row lists); empty/missing -> NA
+    main = df["genres"].astype("string[pyarrow]").str.extract(r"^\s*([^,]*?)\s*(?:,|$)", expand=False)
+    df["main_genre"] = main.mask(main == "")
     return df
 
 def add_decade(df: pd.DataFrame) -> pd.DataFrame:
     if "year" not in df.columns:
         return df
-    y = coerce_numeric(df["year"])
-    df["decade"] = (y // 10) * 10
+    y = pd.to_numeric(df["year"], errors="coerce", downcast="integer")
+    if pd.api.types.is_integer_dtype(y.dtype):
+        # Integer years (nullable Int16 from the typed loaders, or plain ints):
+        # floor to the decade in place on the raw values, then reattach the NA mask
+        nullable = isinstance(y.dtype, pd.api.extensions.ExtensionDtype)
+        mask = y.isna().to_numpy()
+        y_arr = y.to_numpy(dtype=getattr(y.dtype, "numpy_dtype", y.dtype), na_value=0, copy=True)
+        np.floor_divide(y_arr, 10, out=y_arr)
+        np.multiply(y_arr, 10, out=y_arr)
+        df["decade"] = pd.arrays.IntegerArray(y_arr, mask) if nullable else y_arr
+    else:
+        df["decade"] = (y // 10) * 10
     return df
 
 def to_director_list(val):
@@ -74,132 +126,155 @@ def plot_rating_histogram(df: pd.DataFrame):
     if "rating" not in df.columns:
         logging.warning("rating column not found; skipping histogram.")
         return
-    r = coerce_numeric(df["rating"]).dropna()
+    r = df["rating"].dropna()
     if r.empty:
         logging.warning("No numeric ratings; skipping histogram.")
         return
-    r.plot(kind="hist", bins=15, title="IMDb Rating Distribution")
-    plt.xlabel("Rating")
-    plt.ylabel("Count")
-    save_current_fig("ratings_histogram.png")
+    fig = Figure()
+    ax = fig.subplots()
+    r.plot(kind="hist", bins=15, title="IMDb Rating Distribution", ax=ax)
+    ax.set_xlabel("Rating")
+    ax.set_ylabel("Count")
+    save_fig(fig, "ratings_histogram.png")
 
 def plot_rating_by_main_genre(df: pd.DataFrame):
     needed = {"rating", "main_genre"}
     if not needed.issubset(df.columns):
         logging.warning("Columns rating/main_genre missing; skipping genre boxplot.")
         return
-    tmp = df.copy()
-    tmp["rating"] = coerce_numeric(tmp["rating"])
+    # Only the two plotted columns; no full-frame copy
+    tmp = pd.DataFrame({"rating": df["rating"], "main_genre": df["main_genre"]})
     tmp = tmp.dropna(subset=["rating", "main_genre"])
     if tmp.empty:
         logging.warning("No data for rating-by-genre; skipping.")
         return
-    tmp.boxplot(column="rating", by="main_genre", rot=45)
-    plt.title("Rating by Main Genre")
-    plt.suptitle("")
-    plt.xlabel("Main Genre")
-    plt.ylabel("Rating")
-    save_current_fig("rating_by_genre_boxplot.png")
+    fig = Figure()
+    ax = fig.subplots()
+    tmp.boxplot(column="rating", by="main_genre", rot=45, ax=ax)
+    ax.set_title("Rating by Main Genre")
+    fig.suptitle("")
+    ax.set_xlabel("Main Genre")
+    ax.set_ylabel("Rating")
+    save_fig(fig, "rating_by_genre_boxplot.png")
 
 def plot_votes_vs_rating(df: pd.DataFrame):
     for col in ("rating", "votes"):
         if col not in df.columns:
             logging.warning(f"{col} not found; skipping votes vs rating scatter.")
             return
-    tmp = df.copy()
-    tmp["rating"] = coerce_numeric(tmp["rating"])
-    tmp["votes"] = coerce_numeric(tmp["votes"])
+    tmp = pd.DataFrame({"votes": df["votes"], "rating": df["rating"]})
     tmp = tmp.dropna(subset=["rating", "votes"])
     if tmp.empty:
         logging.warning("No numeric votes/ratings; skipping scatter.")
         return
-    tmp.plot(kind="scatter", x="votes", y="rating", title="Votes vs Rating", alpha=0.7)
-    plt.xlabel("Votes")
-    plt.ylabel("Rating")
-    save_current_fig("votes_vs_rating_scatter.png")
+    fig = Figure()
+    ax = fig.subplots()
+    if len(tmp) > HEXBIN_MIN_POINTS:
+        # One binned mesh instead of a marker per movie
+        hb = ax.hexbin(tmp["votes"].to_numpy(dtype=float), tmp["rating"].to_numpy(dtype=float), gridsize=60, bins="log")
+        fig.colorbar(hb, ax=ax, label="Movies (log)")
+        ax.set_title("Votes vs Rating")
+    else:
+        tmp.plot(kind="scatter", x="votes", y="rating", title="Votes vs Rating", alpha=0.7, rasterized=True, ax=ax)
+    ax.set_xlabel("Votes")
+    ax.set_ylabel("Rating")
+    save_fig(fig, "votes_vs_rating_scatter.png")
 
 def plot_rating_by_decade(df: pd.DataFrame):
     if "decade" not in df.columns or "rating" not in df.columns:
         logging.warning("Columns rating/decade missing; skipping decade boxplot.")
         return
-    tmp = df.copy()
-    tmp["rating"] = coerce_numeric(tmp["rating"])
-    tmp["decade"] = coerce_numeric(tmp["decade"])
+    tmp = pd.DataFrame({"rating": df["rating"], "decade": df["decade"]})
     tmp = tmp.dropna(subset=["rating", "decade"])
     if tmp.empty:
         logging.warning("No data for rating-by-decade; skipping.")
         return
-    tmp.boxplot(column="rating", by="decade", rot=45)
-    plt.title("Rating by Decade")
-    plt.suptitle("")
-    plt.xlabel("Decade")
-    plt.ylabel("Rating")
-    save_current_fig("rating_by_decade_boxplot.png")
-
-def table_top10_by_votes(df: pd.DataFrame):
+    fig = Figure()
+    ax = fig.subplots()
+    tmp.boxplot(column="rating", by="decade", rot=45, ax=ax)
+    ax.set_title("Rating by Decade")
+    fig.suptitle("")
+    ax.set_xlabel("Decade")
+    ax.set_ylabel("Rating")
+    save_fig(fig, "rating_by_decade_boxplot.png")
+
+def table_top10_by_votes(df: pd.DataFrame, fmt: str = "csv"):
     if "votes" not in df.columns:
         logging.warning("votes column not found; skipping top10 by votes.")
         return
-    tmp = df.copy()
-    tmp["votes"] = coerce_numeric(tmp["votes"])
-    tmp = tmp.sort_values("votes", ascending=False).head(10)
+    # Rank on the votes column alone, then pull just the 10 winning rows
+    top_idx = df["votes"].sort_values(ascending=False).head(10).index
+    tmp = df.loc[top_idx]
     cols = [c for c in ["title", "year", "rating", "votes"] if c in tmp.columns]
     if not cols:
         logging.warning("No expected columns to print for top10 by votes.")
         return
     print("\nTop 10 Movies by Votes:\n", tmp[cols])
-    outp = REPORTS_DIR / "top10_by_votes.csv"
-    tmp.to_csv(outp, index=False)
-    logging.info(f"Saved table -> {outp}")
+    save_table(tmp, "top10_by_votes", fmt)
 
-def table_top_directors_avg_rating(df: pd.DataFrame, min_films: int = 2):
+def table_top_directors_avg_rating(df: pd.DataFrame, min_films: int = 2, fmt: str = "csv"):
     if "directors" not in df.columns or "rating" not in df.columns:
         logging.warning("directors/rating missing; skipping director leaderboard.")
         return
-    tmp = df.copy()
-    tmp["rating"] = coerce_numeric(tmp["rating"])
-    tmp["directors"] = tmp["directors"].apply(to_director_list)
-    tmp = tmp.dropna(subset=["rating", "directors"]).explode("directors").dropna(subset=["directors"])
+    tmp = pd.DataFrame({
+        "rating": df["rating"],
+        "directors": df["directors"].astype("string").str.strip().str.split(r"\s*,\s*", regex=True),
+    })
+    tmp = tmp.dropna(subset=["rating", "directors"]).explode("directors")
+    tmp = tmp[tmp["directors"].str.len().gt(0) & tmp["directors"].ne("nan")]
     if tmp.empty:
         logging.info("No usable director data; skipping.")
         return
-    director_stats = (
-        tmp.groupby("directors", dropna=True)
-          .agg(n_films=("title", "count"), avg_rating=("rating", "mean"))
-          .query("n_films >= @min_films")
-          .sort_values("avg_rating", ascending=False)
-    )
+    # Single numeric column per group: factorize once, then count and sum in one pass.
+    # n_films counts rated rows, so films scraped without a title are included
+    # (the old ("title", "count") aggregation skipped them).
+    codes, uniques = pd.factorize(tmp["directors"], sort=False)
+    sums, counts = group_sum_count(codes, tmp["rating"].to_numpy(dtype=np.float64), len(uniques))
+    keep = counts >= min_films
+    director_stats = pd.DataFrame(
+        {"n_films": counts[keep], "avg_rating": sums[keep] / counts[keep]},
+        index=pd.Index(np.asarray(uniques)[keep], name="directors"),
+    ).sort_values("avg_rating", ascending=False)
     if director_stats.empty:
         logging.info(f"No directors with at least {min_films} films; skipping.")
         return
     print(f"\nTop Directors by Avg Rating (min {min_films} films):\n", director_stats.head(10))
-    outp = REPORTS_DIR / "top_directors_avg_rating.csv"
-    director_stats.to_csv(outp)
-    logging.info(f"Saved table -> {outp}")
+    save_table(director_stats, "top_directors_avg_rating", fmt, index=True)
 
 # -----------------------------
 # Main
 # -----------------------------
 def main():
     ap = argparse.ArgumentParser(description="IMDb Ratings EDA")
-    ap.add_argument("--input", type=str, required=True, help="Path to tidy CSV from scraper.")
+    ap.add_argument("--input", type=str, required=True, help="Path to tidy Parquet/CSV from scraper.")
     ap.add_argument("--min_director_films", type=int, default=2, help="Min films per director to include.")
+    ap.add_argument("--format", choices=("csv", "parquet"), default="csv", help="Format for saved report tables.")
     args = ap.parse_args()
 
-    df = pd.read_csv(args.input)
+    df = load_dataset(Path(args.input))
+    # Coerce numeric columns once here; the EDA steps below read them as-is
+    for col in NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = coerce_numeric(df[col])
     # Derived columns
     df = add_decade(df)
     df = normalize_genres(df)
 
-    # Plots
-    plot_rating_histogram(df)
-    plot_rating_by_main_genre(df)
-    plot_votes_vs_rating(df)
-    plot_rating_by_decade(df)
+    # Plots only read df and render to their own Figure; run them side by side
+    plots = [
+        plot_rating_histogram,
+        plot_rating_by_main_genre,
+        plot_votes_vs_rating,
+        plot_rating_by_decade,
+    ]
+    with ThreadPoolExecutor(max_workers=len(plots)) as ex:
+        rendered = ex.map(lambda plot: plot(df), plots)
+
+        # Tables print to stdout, so they run here, one after the other, to keep their output intact
+        table_top10_by_votes(df, fmt=args.format)
+        table_top_directors_avg_rating(df, min_films=args.min_director_films, fmt=args.format)
 
-    # Tables
-    table_top10_by_votes(df)
-    table_top_directors_avg_rating(df, min_films=args.min_director_films)
+        list(rendered)  # re-raise any plot failure
 
     logging.info(f"Figures saved to {FIG_DIR}")
 
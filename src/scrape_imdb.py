@@ -1,16 +1,28 @@
 import argparse
+import asyncio
+import csv
+import gzip
 import json
 import re
-import time
 import logging
+import mmap
+import os
+import statistics
+import tempfile
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
-import requests
-import pandas as pd
+import httpx
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+import soupsieve as sv
 from bs4 import BeautifulSoup
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
+
+SoupGetter = Callable[[], BeautifulSoup]  # builds the page soup lazily, at most once
 
 # -----------------------------
 # Config
@@ -24,83 +36,153 @@ HEADERS = {
 }
 BASE_URL = "https://www.imdb.com/title/{tid}/"
 DEFAULT_TIMEOUT = 15  # seconds
+DEFAULT_CONCURRENCY = 10
+DEFAULT_CACHE_DIR = Path(".cache/imdb")
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+CSV_FIELDS = [
+    "title", "year", "rating", "votes", "genres", "runtime_min",
+    "certificate", "directors", "imdb_id", "url",
+]
+PARQUET_SCHEMA = pa.schema([
+    ("title", pa.string()),
+    ("year", pa.int32()),
+    ("rating", pa.float64()),
+    ("votes", pa.int64()),
+    ("genres", pa.string()),
+    ("runtime_min", pa.int32()),
+    ("certificate", pa.string()),
+    ("directors", pa.string()),
+    ("imdb_id", pa.string()),
+    ("url", pa.string()),
+])
+OUTPUT_FORMATS = ("csv", "parquet")
+FLUSH_EVERY = 50  # rows between CSV flushes
+PARQUET_BATCH = 1000  # rows per Parquet row group
+
+# Patterns used on every page, compiled once at import
+_JSONLD_RE = re.compile(rb'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL)
+_ID_RE = re.compile(rb"^[ \t]*(tt[0-9a-zA-Z]+)", re.MULTILINE)
+_YEAR_RE = re.compile(r"(\d{4})")
+_DP_RE = re.compile(r"^(\d{4})")
+_PT_RE = re.compile(r"PT(\d+)M")
+_TITLE_SEL = sv.compile("h1[data-testid='hero-title-block__title']")
+_YEAR_SEL = sv.compile("ul[data-testid='hero-title-block__metadata'] li a[href*='releaseinfo']")
+_GENRE_SEL = sv.compile("a[href*='genres=']")
+_CERT_SEL = sv.compile("[data-testid='storyline-certificate'] a, a[href*='parentalguide']")
+_CREDIT_SEL = sv.compile("li[data-testid='title-pc-principal-credit']")
+_NAME_LINK_SEL = sv.compile("a[href*='/name/']")
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(levelname)s: %(message)s"
 )
+# httpx logs every request at INFO; keep the per-title progress lines readable
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # -----------------------------
 # Helpers
 # -----------------------------
-def build_session(total_retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+def build_client(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int = DEFAULT_TIMEOUT,
+    total_retries: int = 3,
+) -> httpx.AsyncClient:
     """
-    Create a requests Session with retry + backoff for transient errors.
+    Create an HTTP/2 AsyncClient whose pool matches the concurrency limit.
+    The transport retries failed connection attempts; fetch_html handles the rest.
     """
-    retry = Retry(
-        total=total_retries,
-        read=total_retries,
-        connect=total_retries,
-        status=total_retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=frozenset(["GET", "HEAD"]),
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    s = requests.Session()
-    s.headers.update(HEADERS)
-    s.mount("https://", adapter)
-    s.mount("http://", adapter)
-    return s
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    # A custom transport ignores the client's http2/limits, so they are set here
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=total_retries)
+    return httpx.AsyncClient(headers=HEADERS, timeout=timeout, transport=transport)
+
+async def fetch_html(
+    client: httpx.AsyncClient,
+    url: str,
+    total_retries: int = 3,
+    backoff_factor: float = 0.5,
+) -> Tuple[int, bytes]:
+    """
+    GET a page with retry + exponential backoff for transient errors.
+    Mirrors the old urllib3 Retry config: retries timeouts/read errors and
+    RETRY_STATUSES, and returns the last (status, body) instead of raising.
+    """
+    for attempt in range(total_retries + 1):
+        last_try = attempt == total_retries
+        try:
+            resp = await client.get(url)
+            if resp.status_code not in RETRY_STATUSES or last_try:
+                return resp.status_code, resp.content
+        except (httpx.TimeoutException, httpx.ReadError, httpx.RemoteProtocolError):
+            if last_try:
+                raise
+        await asyncio.sleep(backoff_factor * (2 ** attempt))
+    raise RuntimeError(f"retries exhausted for {url}")
+
+def _cache_path(cache_dir: Optional[Path], tid: str) -> Optional[Path]:
+    return cache_dir / f"{tid}.html.gz" if cache_dir is not None else None
+
+def _write_cache(path: Path, html: bytes) -> None:
+    """
+    Gzip a fetched page into the cache; write-then-rename so readers never see a partial file.
+    Each writer gets its own temp file, so duplicate IDs can't race on the rename.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(html, compresslevel=1))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
 
 def read_ids(path: Path) -> List[str]:
     """
     Read IMDb title IDs (one per line). Keeps only lines starting with 'tt'.
+    The file is memory-mapped and scanned with a single regex pass.
     """
-    ids = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        t = line.strip()
-        if t and t.startswith("tt"):
-            ids.append(t)
-    return ids
-
-def _sel_text(soup: BeautifulSoup, selector: str) -> Optional[str]:
-    el = soup.select_one(selector)
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [b.decode("ascii") for b in _ID_RE.findall(mm)]
+
+def _sel_text(soup: BeautifulSoup, selector: sv.SoupSieve) -> Optional[str]:
+    el = selector.select_one(soup)
     return el.get_text(strip=True) if el else None
 
-def _parse_json_ld(soup: BeautifulSoup) -> dict:
+def _parse_json_ld(html: bytes) -> dict:
     """
-    Safely parse JSON-LD block if present.
+    Safely parse JSON-LD block if present, straight from the raw page bytes.
     """
     data_ld = {}
-    json_ld = soup.find("script", type="application/ld+json")
-    if json_ld and json_ld.string:
+    m = _JSONLD_RE.search(html)
+    if m:
         try:
-            data_ld = json.loads(json_ld.string)
+            data_ld = orjson.loads(m.group(1))
         except Exception:
             data_ld = {}
-    return data_ld
+    return data_ld if isinstance(data_ld, dict) else {}
 
-def _parse_year(soup: BeautifulSoup, data_ld: dict) -> Optional[int]:
+def _parse_year(get_soup: SoupGetter, data_ld: dict) -> Optional[int]:
     """
-    Prefer the visible metadata year; fallback to datePublished in JSON-LD.
+    Prefer datePublished in JSON-LD; fallback to the visible metadata year.
     """
     year = None
-    # Visible “Release” link within the hero metadata inline list
-    y_el = soup.select_one("ul[data-testid='hero-title-block__metadata'] li a[href*='releaseinfo']")
-    if y_el:
-        m = re.search(r"(\d{4})", y_el.get_text(strip=True))
+    dp = data_ld.get("datePublished")
+    if isinstance(dp, str):
+        m = _DP_RE.match(dp)
         if m:
             try:
                 year = int(m.group(1))
             except Exception:
                 year = None
     if year is None:
-        # Fallback: JSON-LD datePublished
-        dp = data_ld.get("datePublished")
-        if isinstance(dp, str):
-            m = re.match(r"(\d{4})", dp)
+        # Fallback: visible “Release” link within the hero metadata inline list
+        y_el = _YEAR_SEL.select_one(get_soup())
+        if y_el:
+            m = _YEAR_RE.search(y_el.get_text(strip=True))
             if m:
                 try:
                     year = int(m.group(1))
@@ -108,14 +190,14 @@ def _parse_year(soup: BeautifulSoup, data_ld: dict) -> Optional[int]:
                     year = None
     return year
 
-def _parse_genres(soup: BeautifulSoup, data_ld: dict) -> Optional[List[str]]:
+def _parse_genres(get_soup: SoupGetter, data_ld: dict) -> Optional[List[str]]:
     genres = data_ld.get("genre")
     if isinstance(genres, str):
         genres = [genres]
     if genres:
         return [g for g in genres if isinstance(g, str) and g.strip()]
     # Fallback: anchor links with genres param
-    found = [g.get_text(strip=True) for g in soup.select("a[href*='genres=']")]
+    found = [g.get_text(strip=True) for g in _GENRE_SEL.select(get_soup())]
     return found or None
 
 def _parse_runtime_minutes(data_ld: dict) -> Optional[int]:
@@ -124,7 +206,7 @@ def _parse_runtime_minutes(data_ld: dict) -> Optional[int]:
     """
     dur = data_ld.get("duration")
     if isinstance(dur, str) and dur.startswith("PT"):
-        m = re.search(r"PT(\d+)M", dur)
+        m = _PT_RE.search(dur)
         if m:
             try:
                 return int(m.group(1))
@@ -132,12 +214,15 @@ def _parse_runtime_minutes(data_ld: dict) -> Optional[int]:
                 return None
     return None
 
-def _parse_certificate(soup: BeautifulSoup) -> Optional[str]:
+def _parse_certificate(get_soup: SoupGetter, data_ld: dict) -> Optional[str]:
+    cr = data_ld.get("contentRating")
+    if isinstance(cr, str) and cr.strip():
+        return cr.strip()
     # IMDb certificate areas can vary; try storyline certificate or parental guide link
-    cert_el = soup.select_one("[data-testid='storyline-certificate'] a, a[href*='parentalguide']")
+    cert_el = _CERT_SEL.select_one(get_soup())
     return cert_el.get_text(strip=True) if cert_el else None
 
-def _parse_directors(soup: BeautifulSoup, data_ld: dict) -> Optional[List[str]]:
+def _parse_directors(get_soup: SoupGetter, data_ld: dict) -> Optional[List[str]]:
     """
     Robustly parse directors:
     1) JSON-LD 'director'
@@ -163,11 +248,11 @@ def _parse_directors(soup: BeautifulSoup, data_ld: dict) -> Optional[List[str]]:
 
     # 3) Page principal credits fallback
     if not names:
-        for li in soup.select("li[data-testid='title-pc-principal-credit']"):
+        for li in _CREDIT_SEL.select(get_soup()):
             label_el = li.find(["span", "h3"])
             label_txt = label_el.get_text(strip=True) if label_el else ""
             if "Director" in label_txt:  # matches 'Director' or 'Directors'
-                anchors = li.select("a[href*='/name/']")
+                anchors = _NAME_LINK_SEL.select(li)
                 extracted = [a.get_text(strip=True) for a in anchors if a.get_text(strip=True)]
                 if extracted:
                     names = extracted
@@ -176,15 +261,22 @@ def _parse_directors(soup: BeautifulSoup, data_ld: dict) -> Optional[List[str]]:
     names = [n.strip() for n in names if n and str(n).strip().lower() != "nan"]
     return names or None
 
-def parse_title_page(html: str) -> Dict:
+def parse_title_page(html: bytes) -> Dict:
     """
     Parse a single title page HTML into a row dict.
+    JSON-LD covers almost every field; the page is only run through
+    BeautifulSoup (once, on first use) when a field has to fall back to the DOM.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    data_ld = _parse_json_ld(soup)
+    data_ld = _parse_json_ld(html)
+    soup_ref: List[Optional[BeautifulSoup]] = [None]
+
+    def get_soup() -> BeautifulSoup:
+        if soup_ref[0] is None:
+            soup_ref[0] = BeautifulSoup(html, "lxml")
+        return soup_ref[0]
 
     # Title
-    title = data_ld.get("name") or _sel_text(soup, "h1[data-testid='hero-title-block__title']")
+    title = data_ld.get("name") or _sel_text(get_soup(), _TITLE_SEL)
 
     # Rating & votes (from JSON-LD aggregateRating)
     rating, votes = None, None
@@ -198,19 +290,19 @@ def parse_title_page(html: str) -> Dict:
         pass
 
     # Year
-    year = _parse_year(soup, data_ld)
+    year = _parse_year(get_soup, data_ld)
 
     # Genres
-    genres = _parse_genres(soup, data_ld)
+    genres = _parse_genres(get_soup, data_ld)
 
     # Runtime minutes
     runtime_min = _parse_runtime_minutes(data_ld)
 
     # Certificate
-    certificate = _parse_certificate(soup)
+    certificate = _parse_certificate(get_soup, data_ld)
 
     # Directors
-    directors_list = _parse_directors(soup, data_ld)
+    directors_list = _parse_directors(get_soup, data_ld)
 
     return {
         "title": title,
@@ -223,42 +315,192 @@ def parse_title_page(html: str) -> Dict:
         "directors": ", ".join(directors_list) if directors_list else None,
     }
 
-def scrape_ids(ids: List[str], sleep_s: float = 1.5, timeout: int = DEFAULT_TIMEOUT) -> pd.DataFrame:
+def _parse_cached(path: Path) -> Optional[Dict]:
     """
-    Scrape multiple title IDs into a DataFrame.
-    - sleep_s: polite delay between requests
+    Read, decompress and parse a cached page; runs in the parse pool so the event loop never blocks on it.
+    A truncated or corrupt entry is removed and reported as a miss (None) so the page is fetched again.
+    """
+    try:
+        html = gzip.decompress(path.read_bytes())
+        if not html:
+            raise EOFError("empty cache entry")
+    except (OSError, EOFError) as e:
+        logging.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+    return parse_title_page(html)
+
+def _cache_and_parse(html: bytes, path: Optional[Path]) -> Dict:
+    """
+    Parse a freshly fetched page and cache it (when caching is on); runs in the parse pool.
+    The cache write is best-effort: a failure is logged and the parsed row is still returned.
+    """
+    row = parse_title_page(html)
+    if path is not None:
+        try:
+            _write_cache(path, html)
+        except OSError as e:
+            logging.warning(f"Could not cache {path.name}: {e}")
+    return row
+
+async def scrape_ids(
+    ids: List[str],
+    sleep_s: float = 1.5,
+    timeout: int = DEFAULT_TIMEOUT,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    pool: Optional[Executor] = None,
+    cache_dir: Optional[Path] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Scrape multiple title IDs, yielding each row as soon as it is parsed
+    (completion order, not input order). Fetches up to `concurrency` pages at a time.
+    - sleep_s: polite delay per request, spread across the concurrent slots
     - timeout: request timeout (seconds)
+    - concurrency: max in-flight requests (and open connections); at most
+      2 * concurrency pages are held in memory (fetched or read from cache) at once
+    - pool: executor for parse_title_page; parses inline when None
+    - cache_dir: where gzipped pages are kept between runs; cached IDs skip the network
     """
-    session = build_session()
-    rows = []
-    for i, tid in enumerate(ids, start=1):
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(concurrency)
+    # Bounds whole fetch/read + parse pipelines, so warm-cache reruns don't load every page at once
+    inflight = asyncio.Semaphore(2 * concurrency)
+    pace_s = sleep_s / concurrency
+
+    async def parse(fn: Callable[..., Optional[Dict]], *args) -> Optional[Dict]:
+        # Parsing (and cache I/O) is CPU/disk-bound; run it off the event loop so fetches keep flowing
+        if pool is None:
+            return fn(*args)
+        return await loop.run_in_executor(pool, fn, *args)
+
+    async def fetch(client: httpx.AsyncClient, i: int, tid: str) -> Optional[Dict]:
         url = BASE_URL.format(tid=tid)
+        cache_path = _cache_path(cache_dir, tid)
         try:
-            resp = session.get(url, timeout=timeout)
-            if resp.status_code != 200:
-                logging.warning(f"{i}/{len(ids)} [warn] {tid} -> HTTP {resp.status_code}")
-                time.sleep(sleep_s)
-                continue
-            row = parse_title_page(resp.text)
+            async with inflight:
+                row = None
+                if cache_path is not None and cache_path.exists():
+                    row = await parse(_parse_cached, cache_path)
+                if row is None:
+                    async with sem:
+                        try:
+                            status, html = await fetch_html(client, url)
+                        finally:
+                            await asyncio.sleep(pace_s)
+                    if status != 200:
+                        logging.warning(f"{i}/{len(ids)} [warn] {tid} -> HTTP {status}")
+                        return None
+                    row = await parse(_cache_and_parse, html, cache_path)
             row["imdb_id"] = tid
             row["url"] = url
-            rows.append(row)
             logging.info(f"{i}/{len(ids)} [ok] {tid} -> {row.get('title')}")
-            time.sleep(sleep_s)
+            return row
         except Exception as e:
             logging.error(f"{i}/{len(ids)} [error] {tid}: {e}")
-            time.sleep(sleep_s)
-    return pd.DataFrame(rows)
+            return None
+
+    async with build_client(concurrency=concurrency, timeout=timeout) as client:
+        tasks = [asyncio.ensure_future(fetch(client, i, tid)) for i, tid in enumerate(ids, start=1)]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                row = await fut
+                if row is not None:
+                    yield row
+        finally:
+            for t in tasks:
+                t.cancel()
+
+@contextmanager
+def _csv_sink(out_path: Path) -> Iterator[Callable[[Dict], None]]:
+    """
+    Yield a write(row) callable that appends rows to a CSV, flushing every FLUSH_EVERY rows.
+    """
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        w.writeheader()
+        n = 0
+
+        def write(row: Dict) -> None:
+            nonlocal n
+            w.writerow(row)
+            n += 1
+            if n % FLUSH_EVERY == 0:
+                f.flush()
+
+        yield write
+
+@contextmanager
+def _parquet_sink(out_path: Path) -> Iterator[Callable[[Dict], None]]:
+    """
+    Yield a write(row) callable that buffers rows into Snappy-compressed Parquet row groups.
+    """
+    batch: List[Dict] = []
+    with pq.ParquetWriter(out_path, PARQUET_SCHEMA, compression="snappy") as pw:
+
+        def flush() -> None:
+            if batch:
+                pw.write_table(pa.Table.from_pylist(batch, schema=PARQUET_SCHEMA))
+                batch.clear()
+
+        def write(row: Dict) -> None:
+            batch.append(row)
+            if len(batch) >= PARQUET_BATCH:
+                flush()
+
+        try:
+            yield write
+        finally:
+            flush()
+
+async def scrape_to_file(ids: List[str], out_path: Path, fmt: str = "parquet", **scrape_kwargs) -> Dict:
+    """
+    Stream scraped rows into out_path (csv or parquet) as they arrive and return summary stats.
+    Only the fields the summary needs are kept in memory, not whole rows.
+    """
+    n_titles = 0
+    ratings: List[float] = []
+    genre_counter: Counter = Counter()
+    director_count = 0
+    sink = _parquet_sink if fmt == "parquet" else _csv_sink
+    with sink(out_path) as write_row:
+        async for row in scrape_ids(ids, **scrape_kwargs):
+            write_row(row)
+            n_titles += 1
+            if row.get("rating") is not None:
+                ratings.append(row["rating"])
+            if row.get("genres"):
+                genre_counter.update(row["genres"].split(", "))
+            director_count += bool(row.get("directors"))
+
+    return {
+        "n_titles": n_titles,
+        "rating_mean": statistics.fmean(ratings) if ratings else None,
+        "rating_median": float(statistics.median(ratings)) if ratings else None,
+        "top_genres": dict(genre_counter.most_common(10)),
+        "n_with_directors": director_count,
+    }
 
 # -----------------------------
 # Main
 # -----------------------------
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
 def main():
-    ap = argparse.ArgumentParser(description="Scrape IMDb title pages -> tidy CSV + summary.json")
+    ap = argparse.ArgumentParser(description="Scrape IMDb title pages -> tidy Parquet/CSV + summary.json")
     ap.add_argument("--ids", type=str, required=True, help="Path to text file with IMDb title IDs (one per line).")
-    ap.add_argument("--out", type=str, required=True, help="Output CSV path.")
+    ap.add_argument("--out", type=str, required=True, help="Output path; the suffix is set from --format.")
+    ap.add_argument("--format", choices=OUTPUT_FORMATS, default="parquet", help="Output file format.")
     ap.add_argument("--sleep", type=float, default=1.5, help="Seconds to sleep between requests (politeness).")
     ap.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds.")
+    ap.add_argument("--concurrency", type=_positive_int, default=DEFAULT_CONCURRENCY, help="Max concurrent requests.")
+    ap.add_argument("--workers", type=_positive_int, default=os.cpu_count(), help="Processes used to parse pages.")
+    ap.add_argument("--cache-dir", type=str, default=str(DEFAULT_CACHE_DIR), help="Directory for cached page HTML.")
+    ap.add_argument("--no-cache", action="store_true", help="Always fetch pages; don't read or write the cache.")
     args = ap.parse_args()
 
     ids = read_ids(Path(args.ids))
@@ -266,29 +508,29 @@ def main():
         logging.error("No valid IMDb IDs found. Ensure your file contains lines like 'tt0111161'.")
         raise SystemExit(2)
 
-    df = scrape_ids(ids, sleep_s=args.sleep, timeout=args.timeout)
-
-    out_path = Path(args.out)
+    out_path = Path(args.out).with_suffix(f".{args.format}")
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False)
-
-    # Summary for quick reporting
-    summary = {
-        "n_titles": int(len(df)),
-        "rating_mean": float(pd.to_numeric(df.get("rating"), errors="coerce").mean()) if len(df) else None,
-        "rating_median": float(pd.to_numeric(df.get("rating"), errors="coerce").median()) if len(df) else None,
-        "top_genres": (
-            df["genres"].dropna().str.split(", ").explode().value_counts().head(10).to_dict()
-            if "genres" in df.columns and len(df)
-            else {}
-        ),
-        "n_with_directors": int(df["directors"].notna().sum()) if "directors" in df.columns else 0,
-    }
+
+    cache_dir = None if args.no_cache else Path(args.cache_dir)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Rows are written as they complete; summary stats come back for reporting
+        summary = asyncio.run(
+            scrape_to_file(
+                ids,
+                out_path,
+                fmt=args.format,
+                sleep_s=args.sleep,
+                timeout=args.timeout,
+                concurrency=args.concurrency,
+                pool=pool,
+                cache_dir=cache_dir,
+            )
+        )
     reports_dir = Path("reports")
     reports_dir.mkdir(parents=True, exist_ok=True)
     (reports_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
 
-    logging.info(f"Saved CSV -> {out_path}")
+    logging.info(f"Saved {args.format} -> {out_path}")
     logging.info(f"Saved summary -> {reports_dir/'summary.json'}")
 
 if __name__ == "__main__":